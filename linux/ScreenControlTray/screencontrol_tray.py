@@ -13,6 +13,11 @@ Requirements:
     sudo apt install python3-gi python3-gi-cairo gir1.2-gtk-3.0 \
         gir1.2-ayatanaappindicator3-0.1 python3-pil python3-xlib \
         python3-requests xdotool scrot
+
+Optional:
+    pip install mss       # faster in-process screen capture (XShmGetImage)
+    pip install orjson    # faster JSON encoding for bridge responses
+    pip install pybase64  # SIMD base64 for return_base64 screenshots
 """
 
 import gi
@@ -32,20 +37,51 @@ except (ValueError, ImportError):
         AppIndicator3 = None
         INDICATOR_TYPE = 'none'
 
-from gi.repository import Gtk, GLib, GdkPixbuf, Gdk
+from gi.repository import Gtk, GLib, GdkPixbuf, Gdk, Gio
 import os
 import sys
 import json
+import argparse
+import atexit
 import signal
+import re
+import shutil
+import socket
 import threading
+import time
 import subprocess
 import tempfile
 import base64
 import io
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 import requests
+from requests.adapters import HTTPAdapter
+
+# mss is optional - screen capture falls back to Xlib, then scrot
+try:
+    import mss
+except ImportError:
+    mss = None
+
+# pybase64 is optional - SIMD base64 encoding, falls back to the stdlib
+try:
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    _b64encode = base64.b64encode
+
+# orjson is optional - falls back to the stdlib json module
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(data):
+        return json.dumps(data).encode()
+
+    _json_loads = json.loads
 
 # Configure logging
 logging.basicConfig(
@@ -65,18 +101,137 @@ GUI_BRIDGE_PORT = 3460
 SERVICE_PORT = 3459
 VERSION = "1.2.0"
 
+# Timeout for local service calls: (connect, read) in seconds
+SERVICE_TIMEOUT = (0.5, 2)
+
+# How long a captured frame may be served again (seconds)
+SCREENSHOT_CACHE_TTL = 0.1
+
+# xdotool-style modifier aliases -> X keysym names
+MODIFIER_KEYSYMS = {
+    'ctrl': 'Control_L',
+    'control': 'Control_L',
+    'alt': 'Alt_L',
+    'shift': 'Shift_L',
+    'super': 'Super_L',
+    'meta': 'Meta_L',
+}
+
+# Characters whose keysym name differs from the character itself
+CHAR_KEYSYMS = {
+    '\n': 'Return',
+    '\r': 'Return',
+    '\t': 'Tab',
+}
+
+# How long a parsed window list may be served again (seconds)
+WINDOW_LIST_TTL = 0.2
+
+# Output parsers for xdotool getmouselocation and wmctrl -l -p
+_MOUSE_LOCATION_RE = re.compile(rb'x:(\d+) y:(\d+)')
+_WMCTRL_LINE_RE = re.compile(r'^(\S+)[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S.*?)\s*$', re.M)
+
+# Base64 screenshots are encoded and written in slices of this many input
+# bytes; a multiple of 3 so the chunks concatenate without padding
+BASE64_CHUNK_SIZE = 3 * 256 * 1024
+
+# Default size of the GUI bridge worker pool
+DEFAULT_HTTP_THREADS = min(32, (os.cpu_count() or 1) * 2)
+
+# Seconds a client may stall on a socket read/write before its worker is freed
+HTTP_REQUEST_TIMEOUT = 10
+
+# Raw response sent when every worker is busy
+BUSY_RESPONSE = (
+    b'HTTP/1.0 503 Service Unavailable\r\n'
+    b'Content-Type: application/json\r\n'
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Retry-After: 1\r\n'
+    b'Connection: close\r\n'
+    b'\r\n'
+    b'{"error": "Server busy"}'
+)
+
+# Shared keep-alive session for talking to the local service
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
 # Icon paths (will be set based on installation)
 ICON_CONNECTED = "screencontrol-connected"
 ICON_DISCONNECTED = "screencontrol-disconnected"
 ICON_FALLBACK = "network-transmit-receive"
 
 
+def _block_shutdown_signals():
+    """Block SIGINT/SIGTERM in the calling thread.
+
+    Run at the start of every worker thread so the kernel always delivers
+    these signals to the main thread, where the GTK loop handles shutdown.
+    """
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT, signal.SIGTERM})
+
+
 class ScreenController:
     """Handles screen capture and input simulation."""
 
-    def __init__(self):
+    def __init__(self, screenshot_ttl=SCREENSHOT_CACHE_TTL):
         self.display = None
+        self.screenshot_ttl = screenshot_ttl
+        self.width = 0
+        self.height = 0
+
+        # Xlib connections are not thread-safe and every request now runs
+        # on a worker thread, so in-process X calls are serialized.
+        self._x_lock = threading.Lock()
+        # mss keeps its X handles in thread-local storage, so each pool
+        # worker needs its own instance
+        self._mss = threading.local()
+        self._xtest = False
+
+        # XDamage lets an idle screen serve its last frame past the TTL.
+        # Every DamageNotify bumps the generation; a frame may outlive the
+        # TTL only while the generation recorded with it is still current.
+        self._damage = None
+        self._damage_gen = 0
+
+        # Scratch file for scrot/grim fallback captures. scrot/grim create it
+        # with umask permissions, so it lives in a private 0700 directory.
+        shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+        self._shot_dir = tempfile.mkdtemp(prefix='screencontrol-', dir=shm_dir)
+        self._shot_path = os.path.join(self._shot_dir, 'screenshot.png')
+        self._capture_file_lock = threading.Lock()
+        atexit.register(self._remove_shot_file)
+
+        # Screenshot memoization. Input events bump the epoch so a cached
+        # frame is never served after we changed what is on screen.
+        self._shot_lock = threading.Lock()
+        self._screen_epoch = 0
+        self._last_img = (0.0, -1, None, None)  # (captured_at, epoch, damage_gen, PIL.Image)
+        self._shot_cache = {}  # (format, quality, max_w, max_h) -> (captured_at, epoch, damage_gen, bytes)
+
+        # Parsed wmctrl output, dropped whenever we change focus ourselves
+        self._wm_ttl = WINDOW_LIST_TTL
+        self._wm_cache = (0.0, [])  # (fetched_at, windows)
+
         self._init_display()
+        self._log_pillow_build()
+
+    def _log_pillow_build(self):
+        """Log which Pillow build (and JPEG codec) screenshots will use."""
+        try:
+            import PIL
+            from PIL import features
+        except ImportError:
+            logger.warning("Pillow not installed - screenshots unavailable")
+            return
+
+        # Pillow-SIMD publishes versions such as 9.0.0.post1
+        build = 'Pillow-SIMD' if '.post' in PIL.__version__ else 'Pillow'
+        try:
+            turbo = features.check_feature('libjpeg_turbo')
+        except Exception:
+            turbo = False
+        logger.info(f"{build} {PIL.__version__} (libjpeg-turbo: {'yes' if turbo else 'no'})")
 
     def _init_display(self):
         """Initialize X11 display connection."""
@@ -85,54 +240,274 @@ class ScreenController:
             self.display = display.Display()
             self.screen = self.display.screen()
             self.root = self.screen.root
-            logger.info("X11 display initialized")
+            self.width = self.screen.width_in_pixels
+            self.height = self.screen.height_in_pixels
+            self._xtest = self.display.has_extension('XTEST')
+            logger.info(f"X11 display initialized ({self.width}x{self.height}, "
+                        f"XTest {'available' if self._xtest else 'unavailable'})")
         except Exception as e:
             logger.warning(f"X11 initialization failed: {e}")
             self.display = None
 
-    def take_screenshot(self, format='jpeg', quality=80):
-        """Capture the entire screen."""
-        try:
-            # Try using scrot (most reliable across desktops)
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as f:
-                tmp_path = f.name
+        self._capture_backends = []
+        if os.environ.get('XDG_SESSION_TYPE') != 'wayland':
+            if self.display is not None:
+                self._init_damage()
+            if mss is not None:
+                self._capture_backends.append(('mss', self._capture_mss))
+            if self.display is not None and self.screen.root_depth in (24, 32):
+                self._capture_backends.append(('xlib', self._capture_xlib))
+
+    def close(self):
+        """Remove the scratch capture file."""
+        self._remove_shot_file()
+
+    def _remove_shot_file(self):
+        for remove, path in ((os.unlink, self._shot_path), (os.rmdir, self._shot_dir)):
+            try:
+                remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug(f"Could not remove {path}: {e}")
+
+    def _invalidate_screen(self):
+        """Drop cached screenshots after an input event."""
+        with self._shot_lock:
+            self._screen_epoch += 1
+            self._last_img = (0.0, -1, None, None)
+            self._shot_cache.clear()
+
+    def _capture_mss(self):
+        """Capture the screen in-process with mss (uses XShm when available)."""
+        from PIL import Image
+        sct = getattr(self._mss, 'sct', None)
+        if sct is None:
+            sct = self._mss.sct = mss.mss()
+        with self._x_lock:
+            shot = sct.grab(sct.monitors[0])
+            return Image.frombytes('RGB', shot.size, shot.bgra, 'raw', 'BGRX')
+
+    def _capture_xlib(self):
+        """Capture the root window in-process with XGetImage."""
+        from PIL import Image
+        from Xlib import X
+        with self._x_lock:
+            raw = self.root.get_image(0, 0, self.width, self.height, X.ZPixmap, 0xffffffff)
+            return Image.frombytes('RGB', (self.width, self.height), raw.data, 'raw', 'BGRX')
+
+    def _capture_image(self):
+        """Capture the entire screen as a PIL image."""
+        # In-process capture first; a backend that fails once is dropped
+        for name, capture in list(self._capture_backends):
+            try:
+                return capture()
+            except Exception as e:
+                logger.warning(f"{name} capture failed, disabling: {e}")
+                self._capture_backends = [b for b in self._capture_backends if b[0] != name]
+
+        return self._capture_subprocess()
+
+    def _capture_subprocess(self):
+        """Capture the entire screen with scrot/grim into a reused PNG."""
+        # One fixed file (in RAM under /dev/shm) is reused for every shot,
+        # so the capture lock keeps concurrent fallbacks off each other's file
+        with self._capture_file_lock:
+            # Drop the previous frame so a capture that silently fails can't
+            # hand it back as a new screenshot
+            try:
+                os.unlink(self._shot_path)
+            except FileNotFoundError:
+                pass
 
             # Use scrot for GNOME/X11, or grim for Wayland
             if os.environ.get('XDG_SESSION_TYPE') == 'wayland':
                 # Try grim for Wayland
-                result = subprocess.run(['grim', tmp_path], capture_output=True)
+                result = subprocess.run(['grim', self._shot_path], capture_output=True)
                 if result.returncode != 0:
                     # Fall back to gnome-screenshot
-                    subprocess.run(['gnome-screenshot', '-f', tmp_path], capture_output=True)
+                    subprocess.run(['gnome-screenshot', '-f', self._shot_path], capture_output=True, check=True)
             else:
-                # X11 - use scrot
-                subprocess.run(['scrot', '-o', tmp_path], capture_output=True, check=True)
+                # X11 - use scrot (-o overwrites in place)
+                subprocess.run(['scrot', '-o', self._shot_path], capture_output=True, check=True)
 
-            # Read and convert image
             from PIL import Image
-            img = Image.open(tmp_path)
-
-            # Convert to requested format
-            output = io.BytesIO()
-            if format.lower() == 'jpeg':
-                if img.mode == 'RGBA':
-                    img = img.convert('RGB')
-                img.save(output, format='JPEG', quality=quality)
-            else:
-                img.save(output, format='PNG')
+            img = Image.open(self._shot_path)
+            img.load()
+            return img
+
+    def _encode_image(self, img, format, quality, max_width=None, max_height=None):
+        """Encode a captured image to JPEG or PNG bytes, downscaling if asked."""
+        from PIL import Image
+        if max_width or max_height:
+            scale = min(
+                max_width / img.width if max_width else 1.0,
+                max_height / img.height if max_height else 1.0
+            )
+            if scale < 1.0:
+                size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+                resample = getattr(Image, 'Resampling', Image).BILINEAR
+                img = img.resize(size, resample)
+
+        output = io.BytesIO()
+        if format == 'jpeg':
+            if img.mode == 'RGBA':
+                img = img.convert('RGB')
+            # 4:2:0 chroma subsampling halves chroma work with no visible
+            # loss on UI screenshots; skip the extra optimize/progressive passes
+            img.save(output, format='JPEG', quality=quality,
+                     optimize=False, progressive=False, subsampling=2)
+        else:
+            img.save(output, format='PNG')
+        return output.getvalue()
 
-            # Clean up
-            os.unlink(tmp_path)
+    def take_screenshot(self, format='jpeg', quality=80, max_width=None, max_height=None):
+        """Capture the entire screen.
 
-            return output.getvalue()
+        A cached frame is reused while it is younger than ``screenshot_ttl``
+        or, when XDamage is available, for as long as nothing on screen has
+        been redrawn since it was captured. An identical request returns the
+        cached bytes; a different format/quality/size only re-encodes.
+        """
+        format = format.lower()
+        key = (format, quality, max_width, max_height)
+
+        try:
+            now = time.monotonic()
+            damage_gen = self._poll_damage() if self._damage is not None else None
+
+            with self._shot_lock:
+                epoch = self._screen_epoch
+
+                def fresh(captured_at, entry_epoch, entry_gen):
+                    unchanged = damage_gen is not None and entry_gen == damage_gen
+                    return entry_epoch == epoch and (unchanged or now - captured_at < self.screenshot_ttl)
+
+                cached = self._shot_cache.get(key)
+                if cached and fresh(*cached[:3]):
+                    return cached[3]
+
+                captured_at, img_epoch, img_gen, img = self._last_img
+                if img is None or not fresh(captured_at, img_epoch, img_gen):
+                    img = None
+
+            if img is None:
+                # Generation as of just before the grab: any redraw after this
+                # point moves it on, so the new frame is never trusted past one
+                img_gen = self._rearm_damage() if self._damage is not None else None
+                img = self._capture_image()
+                captured_at = time.monotonic()
+                with self._shot_lock:
+                    self._last_img = (captured_at, epoch, img_gen, img)
+                    # Encodings of the previous frame must not outlive it
+                    self._shot_cache.clear()
+
+            data = self._encode_image(img, format, quality, max_width, max_height)
+
+            with self._shot_lock:
+                if epoch == self._screen_epoch and self._last_img[3] is img:
+                    self._shot_cache[key] = (captured_at, epoch, img_gen, data)
+
+            return data
         except Exception as e:
             logger.error(f"Screenshot failed: {e}")
             raise
 
+    def _init_damage(self):
+        """Subscribe to XDamage on the root window, if the server supports it."""
+        try:
+            from Xlib.ext import damage
+            if not self.display.has_extension('DAMAGE'):
+                return
+            self.display.damage_query_version()
+            self._damage = self.root.damage_create(damage.DamageReportNonEmpty)
+            self.display.flush()
+            logger.info("XDamage frame tracking enabled")
+        except Exception as e:
+            logger.warning(f"XDamage unavailable: {e}")
+            self._damage = None
+
+    def _poll_damage(self):
+        """Fold pending DamageNotify events in and return the damage generation."""
+        with self._x_lock:
+            return self._fold_damage_events()
+
+    def _fold_damage_events(self):
+        # Caller holds _x_lock
+        from Xlib.ext import damage
+        while self.display.pending_events():
+            if isinstance(self.display.next_event(), damage.DamageNotify):
+                self._damage_gen += 1
+        return self._damage_gen
+
+    def _rearm_damage(self):
+        """Clear accumulated damage just before capturing a new frame.
+
+        Returns the damage generation the new frame should be stored with.
+        """
+        with self._x_lock:
+            gen = self._fold_damage_events()
+            # NonEmpty only reports the empty -> non-empty transition, so the
+            # region has to be emptied for the next redraw to notify us
+            self.display.damage_subtract(self._damage)
+            self.display.flush()
+            return gen
+
+    def _fake_motion(self, x, y):
+        from Xlib import X
+        from Xlib.ext import xtest
+        xtest.fake_input(self.display, X.MotionNotify, x=int(x), y=int(y))
+
+    def _fake_button(self, button, repeat=1):
+        from Xlib import X
+        from Xlib.ext import xtest
+        for _ in range(repeat):
+            xtest.fake_input(self.display, X.ButtonPress, button)
+            xtest.fake_input(self.display, X.ButtonRelease, button)
+
+    def _fake_strokes(self, strokes):
+        """Send (keycode, shifted) strokes, holding Shift where needed."""
+        from Xlib import X, XK
+        from Xlib.ext import xtest
+        shift = self.display.keysym_to_keycode(XK.XK_Shift_L)
+        for code, shifted in strokes:
+            if shifted:
+                xtest.fake_input(self.display, X.KeyPress, shift)
+            xtest.fake_input(self.display, X.KeyPress, code)
+            xtest.fake_input(self.display, X.KeyRelease, code)
+            if shifted:
+                xtest.fake_input(self.display, X.KeyRelease, shift)
+
+    def _keysym_stroke(self, keysym):
+        """Map a keysym to (keycode, shifted), or None if it is not on the keymap."""
+        if not keysym:
+            return None
+        for code, index in self.display.keysym_to_keycodes(keysym):
+            if index in (0, 1):
+                return code, index == 1
+        return None
+
+    def _char_stroke(self, char):
+        """Map a character to (keycode, shifted) via its keysym."""
+        from Xlib import XK
+        if char in CHAR_KEYSYMS:
+            keysym = XK.string_to_keysym(CHAR_KEYSYMS[char])
+        elif ord(char) < 0x100:
+            keysym = ord(char)
+        else:
+            keysym = 0x01000000 | ord(char)
+        return self._keysym_stroke(keysym)
+
     def move_mouse(self, x, y):
         """Move mouse to absolute coordinates."""
         try:
-            subprocess.run(['xdotool', 'mousemove', str(int(x)), str(int(y))], check=True)
+            if self._xtest:
+                with self._x_lock:
+                    self._fake_motion(x, y)
+                    self.display.sync()
+            else:
+                subprocess.run(['xdotool', 'mousemove', str(int(x)), str(int(y))], check=True)
+            self._invalidate_screen()
             return True
         except Exception as e:
             logger.error(f"Mouse move failed: {e}")
@@ -142,8 +517,14 @@ class ScreenController:
         """Click at coordinates."""
         try:
             btn = {'left': '1', 'right': '3', 'middle': '2'}.get(button, '1')
-            subprocess.run(['xdotool', 'mousemove', str(int(x)), str(int(y))], check=True)
-            subprocess.run(['xdotool', 'click', btn], check=True)
+            if self._xtest:
+                with self._x_lock:
+                    self._fake_motion(x, y)
+                    self._fake_button(int(btn))
+                    self.display.sync()
+            else:
+                subprocess.run(['xdotool', 'mousemove', str(int(x)), str(int(y)), 'click', btn], check=True)
+            self._invalidate_screen()
             return True
         except Exception as e:
             logger.error(f"Click failed: {e}")
@@ -152,8 +533,17 @@ class ScreenController:
     def double_click(self, x, y):
         """Double-click at coordinates."""
         try:
-            subprocess.run(['xdotool', 'mousemove', str(int(x)), str(int(y))], check=True)
-            subprocess.run(['xdotool', 'click', '--repeat', '2', '1'], check=True)
+            if self._xtest:
+                with self._x_lock:
+                    self._fake_motion(x, y)
+                    self._fake_button(1, repeat=2)
+                    self.display.sync()
+            else:
+                subprocess.run([
+                    'xdotool', 'mousemove', str(int(x)), str(int(y)),
+                    'click', '--repeat', '2', '1'
+                ], check=True)
+            self._invalidate_screen()
             return True
         except Exception as e:
             logger.error(f"Double-click failed: {e}")
@@ -163,7 +553,13 @@ class ScreenController:
         """Scroll mouse wheel."""
         try:
             btn = '5' if direction == 'down' else '4'
-            subprocess.run(['xdotool', 'click', '--repeat', str(amount), btn], check=True)
+            if self._xtest:
+                with self._x_lock:
+                    self._fake_button(int(btn), repeat=int(amount))
+                    self.display.sync()
+            else:
+                subprocess.run(['xdotool', 'click', '--repeat', str(int(amount)), btn], check=True)
+            self._invalidate_screen()
             return True
         except Exception as e:
             logger.error(f"Scroll failed: {e}")
@@ -172,10 +568,25 @@ class ScreenController:
     def drag(self, start_x, start_y, end_x, end_y):
         """Drag from one point to another."""
         try:
-            subprocess.run(['xdotool', 'mousemove', str(int(start_x)), str(int(start_y))], check=True)
-            subprocess.run(['xdotool', 'mousedown', '1'], check=True)
-            subprocess.run(['xdotool', 'mousemove', str(int(end_x)), str(int(end_y))], check=True)
-            subprocess.run(['xdotool', 'mouseup', '1'], check=True)
+            if self._xtest:
+                from Xlib import X
+                from Xlib.ext import xtest
+                with self._x_lock:
+                    self._fake_motion(start_x, start_y)
+                    xtest.fake_input(self.display, X.ButtonPress, 1)
+                    self._fake_motion(end_x, end_y)
+                    xtest.fake_input(self.display, X.ButtonRelease, 1)
+                    self.display.sync()
+            else:
+                # Chain the whole gesture into a single xdotool process
+                subprocess.run([
+                    'xdotool',
+                    'mousemove', str(int(start_x)), str(int(start_y)),
+                    'mousedown', '1',
+                    'mousemove', str(int(end_x)), str(int(end_y)),
+                    'mouseup', '1'
+                ], check=True)
+            self._invalidate_screen()
             return True
         except Exception as e:
             logger.error(f"Drag failed: {e}")
@@ -184,12 +595,17 @@ class ScreenController:
     def get_mouse_position(self):
         """Get current mouse position."""
         try:
-            result = subprocess.run(['xdotool', 'getmouselocation'], capture_output=True, text=True, check=True)
-            # Parse "x:123 y:456 screen:0 window:12345"
-            parts = result.stdout.strip().split()
-            x = int(parts[0].split(':')[1])
-            y = int(parts[1].split(':')[1])
-            return {'x': x, 'y': y}
+            if self.display is not None:
+                with self._x_lock:
+                    pointer = self.root.query_pointer()
+                return {'x': pointer.root_x, 'y': pointer.root_y}
+
+            output = subprocess.check_output(['xdotool', 'getmouselocation'])
+            # Parse b"x:123 y:456 screen:0 window:12345" without decoding
+            match = _MOUSE_LOCATION_RE.match(output)
+            if match is None:
+                raise ValueError(f"unexpected xdotool output: {output[:80]!r}")
+            return {'x': int(match.group(1)), 'y': int(match.group(2))}
         except Exception as e:
             logger.error(f"Get mouse position failed: {e}")
             return {'x': 0, 'y': 0}
@@ -197,7 +613,19 @@ class ScreenController:
     def type_text(self, text):
         """Type text using keyboard."""
         try:
-            subprocess.run(['xdotool', 'type', '--clearmodifiers', text], check=True)
+            strokes = None
+            if self._xtest:
+                with self._x_lock:
+                    strokes = [self._char_stroke(c) for c in text]
+                    if None not in strokes:
+                        self._fake_strokes(strokes)
+                        self.display.sync()
+
+            # xdotool can remap spare keycodes for characters missing from
+            # the current keymap, so it still handles those
+            if strokes is None or None in strokes:
+                subprocess.run(['xdotool', 'type', '--clearmodifiers', text], check=True)
+            self._invalidate_screen()
             return True
         except Exception as e:
             logger.error(f"Type text failed: {e}")
@@ -226,31 +654,70 @@ class ScreenController:
                 'pagedown': 'Page_Down',
             }
             xdo_key = key_map.get(key.lower(), key)
-            subprocess.run(['xdotool', 'key', xdo_key], check=True)
+
+            strokes = None
+            if self._xtest:
+                strokes = self._key_combo_strokes(xdo_key)
+            if strokes:
+                from Xlib import X, XK
+                from Xlib.ext import xtest
+                # Hold Shift for keysyms on the shifted level (e.g. 'A', 'at')
+                codes = [code for code, _ in strokes]
+                with self._x_lock:
+                    shift = self.display.keysym_to_keycode(XK.XK_Shift_L)
+                    if any(shifted for _, shifted in strokes) and shift not in codes:
+                        codes.insert(0, shift)
+                    for code in codes:
+                        xtest.fake_input(self.display, X.KeyPress, code)
+                    for code in reversed(codes):
+                        xtest.fake_input(self.display, X.KeyRelease, code)
+                    self.display.sync()
+            else:
+                subprocess.run(['xdotool', 'key', xdo_key], check=True)
+            self._invalidate_screen()
             return True
         except Exception as e:
             logger.error(f"Press key failed: {e}")
             return False
 
+    def _key_combo_strokes(self, combo):
+        """Resolve an xdotool-style combo such as 'ctrl+shift+t' to (keycode, shifted) strokes.
+
+        Returns None if any part is not on the current keymap.
+        """
+        from Xlib import XK
+        strokes = []
+        with self._x_lock:
+            for name in combo.split('+'):
+                name = MODIFIER_KEYSYMS.get(name.lower(), name)
+                stroke = self._keysym_stroke(XK.string_to_keysym(name))
+                if stroke is None:
+                    return None
+                strokes.append(stroke)
+        return strokes
+
     def get_windows(self):
         """Get list of open windows."""
+        fetched_at, cached = self._wm_cache
+        if time.monotonic() - fetched_at < self._wm_ttl:
+            return cached
+
         try:
-            result = subprocess.run(
+            output = subprocess.run(
                 ['wmctrl', '-l', '-p'],
                 capture_output=True, text=True, check=True
-            )
-            windows = []
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    parts = line.split(None, 4)
-                    if len(parts) >= 5:
-                        windows.append({
-                            'id': parts[0],
-                            'desktop': parts[1],
-                            'pid': parts[2],
-                            'machine': parts[3],
-                            'title': parts[4] if len(parts) > 4 else ''
-                        })
+            ).stdout
+            windows = [
+                {
+                    'id': m.group(1),
+                    'desktop': m.group(2),
+                    'pid': m.group(3),
+                    'machine': m.group(4),
+                    'title': m.group(5)
+                }
+                for m in _WMCTRL_LINE_RE.finditer(output)
+            ]
+            self._wm_cache = (time.monotonic(), windows)
             return windows
         except Exception as e:
             logger.error(f"Get windows failed: {e}")
@@ -260,6 +727,8 @@ class ScreenController:
         """Focus a window by ID."""
         try:
             subprocess.run(['wmctrl', '-i', '-a', window_id], check=True)
+            self._wm_cache = (0.0, [])
+            self._invalidate_screen()
             return True
         except Exception as e:
             logger.error(f"Focus window failed: {e}")
@@ -270,28 +739,80 @@ class GUIBridgeHandler(BaseHTTPRequestHandler):
     """HTTP handler for GUI bridge server."""
 
     controller = None
+    _base64_hint_logged = False
+
+    # Set TCP_NODELAY so small JSON replies go out immediately
+    disable_nagle_algorithm = True
+
+    # A client that stalls mid-request gives its pool worker back after this
+    timeout = HTTP_REQUEST_TIMEOUT
+
+    # Status line + headers for JSON replies, per status code
+    _json_headers = {}
 
     def log_message(self, format, *args):
         logger.debug(f"HTTP: {args[0]}")
 
+    @classmethod
+    def _json_header(cls, status):
+        """Return the precomputed JSON response head with a %d for the length."""
+        header = cls._json_headers.get(status)
+        if header is None:
+            header = (
+                f'{cls.protocol_version} {status} {cls.responses[status][0]}\r\n'
+                'Content-Type: application/json\r\n'
+                'Access-Control-Allow-Origin: *\r\n'
+                'Content-Length: %d\r\n'
+                '\r\n'
+            ).encode('latin-1')
+            cls._json_headers[status] = header
+        return header
+
     def _send_json(self, data, status=200):
-        self.send_response(status)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        # Headers and body in a single write instead of one per header
+        body = _json_dumps(data)
+        self.log_request(status)
+        self.wfile.write(self._json_header(status) % len(body) + body)
 
     def _send_image(self, data, content_type='image/jpeg'):
         self.send_response(200)
         self.send_header('Content-Type', content_type)
         self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(data)))
         self.end_headers()
         self.wfile.write(data)
 
+    def _send_base64_image(self, data, fmt):
+        """Send an image as base64 inside the JSON envelope.
+
+        Base64 output never needs JSON escaping, so the image is encoded in
+        chunks and written straight between the envelope prefix and suffix
+        rather than being built as one str and copied by the JSON encoder.
+        """
+        if not GUIBridgeHandler._base64_hint_logged:
+            GUIBridgeHandler._base64_hint_logged = True
+            logger.info("Screenshot requested with return_base64=true; the raw "
+                        "image response is smaller and cheaper to produce")
+
+        prefix = b'{"success": true, "format": ' + _json_dumps(fmt) + b', "data": "'
+        suffix = b'"}'
+        b64_length = 4 * ((len(data) + 2) // 3)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(prefix) + b64_length + len(suffix)))
+        self.end_headers()
+        self.wfile.write(prefix)
+        view = memoryview(data)
+        for start in range(0, len(view), BASE64_CHUNK_SIZE):
+            self.wfile.write(_b64encode(view[start:start + BASE64_CHUNK_SIZE]))
+        self.wfile.write(suffix)
+
     def _read_json(self):
         content_length = int(self.headers.get('Content-Length', 0))
         if content_length:
-            return json.loads(self.rfile.read(content_length))
+            return _json_loads(self.rfile.read(content_length))
         return {}
 
     def do_OPTIONS(self):
@@ -301,117 +822,211 @@ class GUIBridgeHandler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         self.end_headers()
 
+    # Route tables: path -> handler method name
+    GET_ROUTES = {
+        '/health': '_get_health',
+        '/screenshot': '_get_screenshot',
+        '/mouse/position': '_get_mouse_position',
+        '/ui/windows': '_get_windows',
+    }
+
+    POST_ROUTES = {
+        '/click': '_post_click',
+        '/double_click': '_post_double_click',
+        '/mouse/move': '_post_mouse_move',
+        '/mouse/scroll': '_post_mouse_scroll',
+        '/mouse/drag': '_post_mouse_drag',
+        '/keyboard/type': '_post_keyboard_type',
+        '/keyboard/key': '_post_keyboard_key',
+        '/ui/focus': '_post_ui_focus',
+    }
+
     def do_GET(self):
         parsed = urlparse(self.path)
         path = parsed.path
-        params = parse_qs(parsed.query)
-
-        try:
-            if path == '/health':
-                self._send_json({'status': 'ok', 'service': 'screencontrol-gui-bridge'})
-
-            elif path == '/screenshot':
-                fmt = params.get('format', ['jpeg'])[0]
-                quality = int(params.get('quality', [80])[0])
-                return_base64 = params.get('return_base64', ['false'])[0].lower() == 'true'
-
-                image_data = self.controller.take_screenshot(format=fmt, quality=quality)
-
-                if return_base64:
-                    b64 = base64.b64encode(image_data).decode()
-                    self._send_json({
-                        'success': True,
-                        'format': fmt,
-                        'data': b64
-                    })
-                else:
-                    content_type = 'image/jpeg' if fmt == 'jpeg' else 'image/png'
-                    self._send_image(image_data, content_type)
-
-            elif path == '/mouse/position':
-                pos = self.controller.get_mouse_position()
-                self._send_json({'success': True, **pos})
-
-            elif path == '/ui/windows':
-                windows = self.controller.get_windows()
-                self._send_json({'success': True, 'windows': windows})
 
-            else:
-                self._send_json({'error': 'Not found'}, 404)
+        handler = self.GET_ROUTES.get(path)
+        if handler is None:
+            self._send_json({'error': 'Not found'}, 404)
+            return
 
+        try:
+            getattr(self, handler)(parse_qs(parsed.query))
         except Exception as e:
             logger.error(f"GET {path} error: {e}")
             self._send_json({'error': str(e)}, 500)
 
     def do_POST(self):
-        parsed = urlparse(self.path)
-        path = parsed.path
+        path = urlparse(self.path).path
 
-        try:
-            data = self._read_json()
-
-            if path == '/click':
-                x = data.get('x', 0)
-                y = data.get('y', 0)
-                button = data.get('button', 'left')
-                success = self.controller.click(x, y, button)
-                self._send_json({'success': success})
-
-            elif path == '/double_click':
-                x = data.get('x', 0)
-                y = data.get('y', 0)
-                success = self.controller.double_click(x, y)
-                self._send_json({'success': success})
-
-            elif path == '/mouse/move':
-                x = data.get('x', 0)
-                y = data.get('y', 0)
-                success = self.controller.move_mouse(x, y)
-                self._send_json({'success': success})
-
-            elif path == '/mouse/scroll':
-                direction = data.get('direction', 'down')
-                amount = data.get('amount', 3)
-                success = self.controller.scroll(direction, amount)
-                self._send_json({'success': success})
-
-            elif path == '/mouse/drag':
-                success = self.controller.drag(
-                    data.get('startX', 0),
-                    data.get('startY', 0),
-                    data.get('endX', 0),
-                    data.get('endY', 0)
-                )
-                self._send_json({'success': success})
+        handler = self.POST_ROUTES.get(path)
+        if handler is None:
+            self._send_json({'error': 'Not found'}, 404)
+            return
 
-            elif path == '/keyboard/type':
-                text = data.get('text', '')
-                success = self.controller.type_text(text)
-                self._send_json({'success': success})
+        try:
+            getattr(self, handler)(self._read_json())
+        except Exception as e:
+            logger.error(f"POST {path} error: {e}")
+            self._send_json({'error': str(e)}, 500)
 
-            elif path == '/keyboard/key':
-                key = data.get('key', '')
-                success = self.controller.press_key(key)
-                self._send_json({'success': success})
+    def _get_health(self, params):
+        self._send_json({'status': 'ok', 'service': 'screencontrol-gui-bridge'})
+
+    def _get_screenshot(self, params):
+        fmt = params.get('format', ['jpeg'])[0]
+        quality = int(params.get('quality', [80])[0])
+        max_width = int(params.get('max_width', [0])[0]) or None
+        max_height = int(params.get('max_height', [0])[0]) or None
+        return_base64 = params.get('return_base64', ['false'])[0].lower() == 'true'
+
+        image_data = self.controller.take_screenshot(
+            format=fmt,
+            quality=quality,
+            max_width=max_width,
+            max_height=max_height
+        )
 
-            elif path == '/ui/focus':
-                window_id = data.get('windowId', '')
-                success = self.controller.focus_window(window_id)
-                self._send_json({'success': success})
+        if return_base64:
+            self._send_base64_image(image_data, fmt)
+        else:
+            content_type = 'image/jpeg' if fmt == 'jpeg' else 'image/png'
+            self._send_image(image_data, content_type)
+
+    def _get_mouse_position(self, params):
+        pos = self.controller.get_mouse_position()
+        self._send_json({'success': True, **pos})
+
+    def _get_windows(self, params):
+        windows = self.controller.get_windows()
+        self._send_json({'success': True, 'windows': windows})
+
+    def _post_click(self, data):
+        x = data.get('x', 0)
+        y = data.get('y', 0)
+        button = data.get('button', 'left')
+        success = self.controller.click(x, y, button)
+        self._send_json({'success': success})
+
+    def _post_double_click(self, data):
+        x = data.get('x', 0)
+        y = data.get('y', 0)
+        success = self.controller.double_click(x, y)
+        self._send_json({'success': success})
+
+    def _post_mouse_move(self, data):
+        x = data.get('x', 0)
+        y = data.get('y', 0)
+        success = self.controller.move_mouse(x, y)
+        self._send_json({'success': success})
+
+    def _post_mouse_scroll(self, data):
+        direction = data.get('direction', 'down')
+        amount = data.get('amount', 3)
+        success = self.controller.scroll(direction, amount)
+        self._send_json({'success': success})
+
+    def _post_mouse_drag(self, data):
+        success = self.controller.drag(
+            data.get('startX', 0),
+            data.get('startY', 0),
+            data.get('endX', 0),
+            data.get('endY', 0)
+        )
+        self._send_json({'success': success})
+
+    def _post_keyboard_type(self, data):
+        text = data.get('text', '')
+        success = self.controller.type_text(text)
+        self._send_json({'success': success})
+
+    def _post_keyboard_key(self, data):
+        key = data.get('key', '')
+        success = self.controller.press_key(key)
+        self._send_json({'success': success})
+
+    def _post_ui_focus(self, data):
+        window_id = data.get('windowId', '')
+        success = self.controller.focus_window(window_id)
+        self._send_json({'success': success})
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTP server that handles requests on a bounded worker pool.
+
+    Connections are handed to a ThreadPoolExecutor instead of a new thread
+    per request. Once every worker is busy, further connections are answered
+    with 503 rather than queued behind a slow screenshot.
+    """
+
+    def __init__(self, server_address, handler_class, max_workers=DEFAULT_HTTP_THREADS):
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='gui-bridge',
+            initializer=_block_shutdown_signals
+        )
+        self.slots = threading.BoundedSemaphore(max_workers)
 
-            else:
-                self._send_json({'error': 'Not found'}, 404)
+        # Sockets queued or being handled, shut down in server_close so the
+        # executor's exit-time join never waits on an idle keep-alive client
+        self._open_requests = set()
+        self._open_lock = threading.Lock()
 
-        except Exception as e:
-            logger.error(f"POST {path} error: {e}")
-            self._send_json({'error': str(e)}, 500)
+    def process_request(self, request, client_address):
+        if not self.slots.acquire(blocking=False):
+            logger.warning(f"GUI bridge busy, rejecting {client_address[0]}")
+            try:
+                request.sendall(BUSY_RESPONSE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+
+        with self._open_lock:
+            self._open_requests.add(request)
+        try:
+            self.executor.submit(self._process_request_worker, request, client_address)
+        except RuntimeError:
+            # Executor already shut down
+            with self._open_lock:
+                self._open_requests.discard(request)
+            self.slots.release()
+            self.shutdown_request(request)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self._open_lock:
+                self._open_requests.discard(request)
+            self.shutdown_request(request)
+            self.slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+        # Unblock workers still reading from a client
+        with self._open_lock:
+            open_requests = list(self._open_requests)
+            self._open_requests.clear()
+        for request in open_requests:
+            try:
+                request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            request.close()
 
 
 class GUIBridgeServer:
     """HTTP server for GUI bridge."""
 
-    def __init__(self, port=GUI_BRIDGE_PORT):
+    def __init__(self, port=GUI_BRIDGE_PORT, threads_http=DEFAULT_HTTP_THREADS):
         self.port = port
+        self.threads_http = threads_http
         self.server = None
         self.thread = None
         self.controller = ScreenController()
@@ -421,34 +1036,46 @@ class GUIBridgeServer:
         GUIBridgeHandler.controller = self.controller
 
         try:
-            self.server = HTTPServer(('127.0.0.1', self.port), GUIBridgeHandler)
-            self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+            self.server = PooledHTTPServer(
+                ('127.0.0.1', self.port),
+                GUIBridgeHandler,
+                max_workers=self.threads_http
+            )
+            self.thread = threading.Thread(target=self._serve, daemon=True)
             self.thread.start()
-            logger.info(f"GUI bridge server started on port {self.port}")
+            logger.info(f"GUI bridge server started on port {self.port} ({self.threads_http} workers)")
             return True
         except Exception as e:
             logger.error(f"Failed to start GUI bridge server: {e}")
             return False
 
+    def _serve(self):
+        _block_shutdown_signals()
+        self.server.serve_forever()
+
     def stop(self):
         """Stop the GUI bridge server."""
         if self.server:
             self.server.shutdown()
+            self.server.server_close()
             logger.info("GUI bridge server stopped")
+        self.controller.close()
 
 
 class ScreenControlTray:
     """Main tray application."""
 
-    def __init__(self):
+    def __init__(self, threads_http=DEFAULT_HTTP_THREADS):
         self.indicator = None
         self.menu = None
         self.gui_bridge = None
         self.connected = False
         self.status_item = None
+        self._probe_lock = threading.Lock()
+        self._notify_proxy = None
 
         # Initialize GUI bridge server
-        self.gui_bridge = GUIBridgeServer()
+        self.gui_bridge = GUIBridgeServer(threads_http=threads_http)
 
     def create_indicator(self):
         """Create the system tray indicator."""
@@ -545,27 +1172,38 @@ class ScreenControlTray:
         self.menu.popup(None, None, Gtk.StatusIcon.position_menu, icon, button, time)
 
     def update_status(self):
-        """Check service status and update indicator."""
-        try:
-            response = requests.get(f'http://127.0.0.1:{SERVICE_PORT}/health', timeout=2)
-            if response.status_code == 200:
-                self.connected = True
-                if self.status_item:
-                    GLib.idle_add(self.status_item.set_label, "Status: Connected")
-                if self.indicator:
-                    GLib.idle_add(self.indicator.set_icon_full, ICON_FALLBACK, "Connected")
-            else:
-                self.connected = False
-                if self.status_item:
-                    GLib.idle_add(self.status_item.set_label, "Status: Disconnected")
-        except:
-            self.connected = False
-            if self.status_item:
-                GLib.idle_add(self.status_item.set_label, "Status: Service not running")
+        """Start a background service status check."""
+        # Skip this tick if the previous probe is still waiting on the network
+        if self._probe_lock.acquire(blocking=False):
+            threading.Thread(target=self._probe_status, daemon=True).start()
 
         # Schedule next check
         return True
 
+    def _probe_status(self):
+        """Check service status off the GTK main loop."""
+        _block_shutdown_signals()
+        try:
+            response = SESSION.get(f'http://127.0.0.1:{SERVICE_PORT}/health', timeout=SERVICE_TIMEOUT)
+            connected = response.status_code == 200
+            label = "Status: Connected" if connected else "Status: Disconnected"
+        except Exception:
+            connected = False
+            label = "Status: Service not running"
+        finally:
+            self._probe_lock.release()
+
+        GLib.idle_add(self._apply_status, connected, label)
+
+    def _apply_status(self, connected, label):
+        """Update the indicator with the probe result (runs on the GTK thread)."""
+        self.connected = connected
+        if self.status_item:
+            self.status_item.set_label(label)
+        if connected and self.indicator:
+            self.indicator.set_icon_full(ICON_FALLBACK, "Connected")
+        return False
+
     def on_start_service(self, widget):
         """Start the ScreenControl service."""
         try:
@@ -612,8 +1250,50 @@ class ScreenControlTray:
             self.gui_bridge.stop()
         Gtk.main_quit()
 
+    def _on_signal(self):
+        """Quit cleanly on SIGINT/SIGTERM."""
+        self.on_quit(None)
+        return GLib.SOURCE_REMOVE
+
     def show_notification(self, title, message):
         """Show a desktop notification."""
+        try:
+            # Talk to the notification daemon directly instead of forking notify-send
+            if self._notify_proxy is None:
+                self._notify_proxy = Gio.DBusProxy.new_for_bus_sync(
+                    Gio.BusType.SESSION,
+                    Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES,
+                    None,
+                    'org.freedesktop.Notifications',
+                    '/org/freedesktop/Notifications',
+                    'org.freedesktop.Notifications',
+                    None
+                )
+            # The proxy is created even when no daemon owns the name, so the
+            # fallback runs from the reply callback if the call itself fails
+            self._notify_proxy.call(
+                'Notify',
+                GLib.Variant('(susssasa{sv}i)', (APP_NAME, 0, ICON_FALLBACK, title, message, [], {}, -1)),
+                Gio.DBusCallFlags.NONE,
+                2000,
+                None,
+                self._on_notify_reply,
+                (title, message)
+            )
+            return
+        except Exception as e:
+            logger.debug(f"D-Bus notification failed, using notify-send: {e}")
+
+        self._notify_send(title, message)
+
+    def _on_notify_reply(self, proxy, result, user_data):
+        try:
+            proxy.call_finish(result)
+        except Exception as e:
+            logger.debug(f"D-Bus notification failed, using notify-send: {e}")
+            self._notify_send(*user_data)
+
+    def _notify_send(self, title, message):
         try:
             subprocess.run(['notify-send', title, message], check=False)
         except:
@@ -638,8 +1318,10 @@ class ScreenControlTray:
         logger.info("ScreenControl tray application started")
 
         # Handle signals
-        signal.signal(signal.SIGINT, lambda s, f: self.on_quit(None))
-        signal.signal(signal.SIGTERM, lambda s, f: self.on_quit(None))
+        # GLib dispatches these from the main loop itself; a plain Python
+        # handler would only run once some other callback woke the loop
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signum, self._on_signal)
 
         # Run GTK main loop
         Gtk.main()
@@ -700,7 +1382,7 @@ class SettingsDialog(Gtk.Dialog):
     def load_settings(self):
         """Load settings from service."""
         try:
-            response = requests.get(f'http://127.0.0.1:{SERVICE_PORT}/settings', timeout=2)
+            response = SESSION.get(f'http://127.0.0.1:{SERVICE_PORT}/settings', timeout=SERVICE_TIMEOUT)
             if response.status_code == 200:
                 return response.json()
         except:
@@ -746,10 +1428,10 @@ X-GNOME-Autostart-enabled=true
                     'agentName': self.name_entry.get_text(),
                     'controlServerUrl': self.url_entry.get_text()
                 }
-                requests.post(
+                SESSION.post(
                     f'http://127.0.0.1:{SERVICE_PORT}/settings',
                     json=data,
-                    timeout=2
+                    timeout=SERVICE_TIMEOUT
                 )
             except Exception as e:
                 logger.error(f"Failed to save settings: {e}")
@@ -760,22 +1442,28 @@ X-GNOME-Autostart-enabled=true
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description=f"{APP_NAME} tray application")
+    parser.add_argument(
+        '--threads-http',
+        type=int,
+        default=DEFAULT_HTTP_THREADS,
+        help=f"GUI bridge worker threads (default: {DEFAULT_HTTP_THREADS})"
+    )
+    args = parser.parse_args()
+
+    if args.threads_http < 1:
+        parser.error("--threads-http must be at least 1")
+
     # Check for required tools
     required_tools = ['xdotool', 'scrot']
-    missing_tools = []
-
-    for tool in required_tools:
-        try:
-            subprocess.run(['which', tool], capture_output=True, check=True)
-        except:
-            missing_tools.append(tool)
+    missing_tools = [tool for tool in required_tools if shutil.which(tool) is None]
 
     if missing_tools:
         logger.warning(f"Missing tools (some features may not work): {', '.join(missing_tools)}")
         logger.info("Install with: sudo apt install " + ' '.join(missing_tools))
 
     # Create and run application
-    app = ScreenControlTray()
+    app = ScreenControlTray(threads_http=args.threads_http)
     return app.run()
 
 
@@ -23,19 +23,56 @@ Usage:
 """
 
 import argparse
+import atexit
 import json
 import sys
 import hashlib
 import base64
 import secrets
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode, urlparse, parse_qs
 
 try:
     import httpx
 except ImportError:
-    print("Please install httpx: pip install httpx")
+    print("Please install httpx: pip install 'httpx[http2]'")
     sys.exit(1)
 
+# orjson is optional - falls back to the stdlib json module
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# HTTP/2 lets the whole discovery -> token -> MCP sequence share one
+# multiplexed connection; it needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+CLIENT_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=20,
+    keepalive_expiry=60.0
+)
+
+
+def _make_transport() -> httpx.HTTPTransport:
+    """Pooled transport shared by the client setup below."""
+    # http2/limits must live on the transport: httpx ignores the client-level
+    # options when an explicit transport is passed
+    return httpx.HTTPTransport(http2=HTTP2_AVAILABLE, limits=CLIENT_LIMITS, retries=1)
+
+
+# OAuth requests go out with httpx's own user-agent, like Claude's
+OAUTH_HEADERS = {"User-Agent": "python-httpx/0.27.2"}
+
+
+# Successful .well-known discovery bodies keyed by URL. The documents are
+# static, so clients for the same server skip the round trip after the first.
+_DISCOVERY_CACHE: dict = {}
+
 
 class ClaudeMCPClient:
     """Simulates Claude's MCP client behavior."""
@@ -43,31 +80,27 @@ class ClaudeMCPClient:
     def __init__(self, base_url: str, endpoint_uuid: str = None, verbose: bool = True):
         self.base_url = base_url.rstrip('/')
         self.endpoint_uuid = endpoint_uuid
+        # Fixed for the client's lifetime, so build it once
+        self._mcp_url = f"{self.base_url}/mcp/{endpoint_uuid}" if endpoint_uuid else None
         self.verbose = verbose
         self.access_token = None
+        self._mcp_headers = {}
         self.refresh_token = None
         self.client_id = None
         self.client_secret = None
         self.oauth_metadata = None
+        self._pkce = None
 
-        # Client setup matching Claude's behavior
+        # Client setup matching Claude's behavior. OAuth calls share it (and its
+        # connections) but override the user-agent and follow redirects.
         self.client = httpx.Client(
             headers={
                 "User-Agent": "Claude-User",  # Claude's actual user-agent
                 "Accept": "application/json",
             },
             timeout=30.0,
-            follow_redirects=False
-        )
-
-        # Separate client for OAuth (uses httpx user-agent like Claude)
-        self.oauth_client = httpx.Client(
-            headers={
-                "User-Agent": "python-httpx/0.27.2",
-                "Accept": "application/json",
-            },
-            timeout=30.0,
-            follow_redirects=True
+            follow_redirects=False,
+            transport=_make_transport()
         )
 
     def log(self, message: str):
@@ -79,16 +112,11 @@ class ClaudeMCPClient:
         """Discover OAuth 2.0 authorization server metadata."""
         self.log("\n=== OAuth Discovery ===")
         url = f"{self.base_url}/.well-known/oauth-authorization-server"
-        self.log(f"GET {url}")
-
-        response = self.oauth_client.get(url)
-        self.log(f"Status: {response.status_code}")
-
-        if response.status_code != 200:
-            self.log(f"Error: {response.text[:500]}")
+        body = self._get_discovery_document(url)
+        if body is None:
             return None
 
-        self.oauth_metadata = response.json()
+        self.oauth_metadata = _json_loads(body)
         self.log(f"Issuer: {self.oauth_metadata.get('issuer')}")
         self.log(f"Token Endpoint: {self.oauth_metadata.get('token_endpoint')}")
         self.log(f"Authorization Endpoint: {self.oauth_metadata.get('authorization_endpoint')}")
@@ -101,16 +129,28 @@ class ClaudeMCPClient:
             url = f"{self.base_url}/.well-known/oauth-protected-resource/mcp/{self.endpoint_uuid}"
         else:
             url = f"{self.base_url}/.well-known/oauth-protected-resource"
-        self.log(f"GET {url}")
+        body = self._get_discovery_document(url)
+        if body is None:
+            return None
+
+        return _json_loads(body)
 
-        response = self.oauth_client.get(url)
+    def _get_discovery_document(self, url: str) -> str:
+        """Fetch a .well-known document, reusing a cached copy if we have one."""
+        if url in _DISCOVERY_CACHE:
+            self.log(f"GET {url} (cached)")
+            return _DISCOVERY_CACHE[url]
+
+        self.log(f"GET {url}")
+        response = self.client.get(url, headers=OAUTH_HEADERS, follow_redirects=True)
         self.log(f"Status: {response.status_code}")
 
         if response.status_code != 200:
-            self.log(f"Error: {response.text[:500]}")
+            self.log(f"Error: {response.content[:500].decode('utf-8', 'replace')}")
             return None
 
-        return response.json()
+        _DISCOVERY_CACHE[url] = response.text
+        return response.text
 
     def register_client(self, redirect_uri: str = "https://claude.ai/api/mcp/auth_callback") -> dict:
         """Dynamically register OAuth client (RFC 7591)."""
@@ -125,12 +165,6 @@ class ClaudeMCPClient:
         self.log("\n=== Dynamic Client Registration ===")
         self.log(f"POST {registration_endpoint}")
 
-        # Generate PKCE values
-        code_verifier = secrets.token_urlsafe(32)
-        code_challenge = base64.urlsafe_b64encode(
-            hashlib.sha256(code_verifier.encode()).digest()
-        ).decode().rstrip('=')
-
         registration_data = {
             "client_name": "Claude MCP Test Client",
             "redirect_uris": [redirect_uri],
@@ -140,29 +174,31 @@ class ClaudeMCPClient:
             "scope": "mcp:tools mcp:resources mcp:prompts mcp:agents:read mcp:agents:write"
         }
 
-        response = self.oauth_client.post(
+        response = self.client.post(
             registration_endpoint,
-            json=registration_data
+            json=registration_data,
+            headers=OAUTH_HEADERS,
+            follow_redirects=True
         )
 
         self.log(f"Status: {response.status_code}")
 
         if response.status_code in [200, 201]:
-            data = response.json()
+            data = _json_loads(response.content)
             self.client_id = data.get('client_id')
             self.client_secret = data.get('client_secret')
             self.log(f"Client ID: {self.client_id}")
             return data
         else:
-            self.log(f"Registration failed: {response.text[:500]}")
+            self.log(f"Registration failed: {response.content[:500].decode('utf-8', 'replace')}")
             return None
 
     def generate_pkce(self) -> tuple:
         """Generate PKCE code verifier and challenge."""
         code_verifier = secrets.token_urlsafe(32)
         code_challenge = base64.urlsafe_b64encode(
-            hashlib.sha256(code_verifier.encode()).digest()
-        ).decode().rstrip('=')
+            hashlib.sha256(code_verifier.encode("ascii")).digest()
+        ).rstrip(b'=').decode('ascii')
         return code_verifier, code_challenge
 
     def get_authorization_url(self, redirect_uri: str = "https://claude.ai/api/mcp/auth_callback") -> tuple:
@@ -173,12 +209,12 @@ class ClaudeMCPClient:
         if not self.client_id:
             self.register_client(redirect_uri)
 
-        code_verifier, code_challenge = self.generate_pkce()
+        # One verifier/challenge pair per authorization, reused if the URL is rebuilt
+        self._pkce = self._pkce or self.generate_pkce()
+        code_verifier, code_challenge = self._pkce
         state = secrets.token_urlsafe(32)
 
-        resource = f"{self.base_url}/mcp"
-        if self.endpoint_uuid:
-            resource = f"{self.base_url}/mcp/{self.endpoint_uuid}"
+        resource = self._mcp_url or f"{self.base_url}/mcp"
 
         params = {
             "response_type": "code",
@@ -212,27 +248,34 @@ class ClaudeMCPClient:
         if self.client_secret:
             data["client_secret"] = self.client_secret
 
-        response = self.oauth_client.post(
+        # The verifier is spent with this code; the next authorization gets a new one
+        self._pkce = None
+
+        response = self.client.post(
             token_endpoint,
             data=data,
-            headers={"Content-Type": "application/x-www-form-urlencoded"}
+            headers={**OAUTH_HEADERS, "Content-Type": "application/x-www-form-urlencoded"},
+            follow_redirects=True
         )
 
         self.log(f"Status: {response.status_code}")
 
         if response.status_code == 200:
-            tokens = response.json()
-            self.access_token = tokens.get('access_token')
+            tokens = _json_loads(response.content)
+            self.set_token(tokens.get('access_token'))
             self.refresh_token = tokens.get('refresh_token')
             self.log(f"Access Token: {self.access_token[:50]}..." if self.access_token else "No access token")
             return tokens
         else:
-            self.log(f"Token exchange failed: {response.text[:500]}")
+            self.log(f"Token exchange failed: {response.content[:500].decode('utf-8', 'replace')}")
             return None
 
     def set_token(self, access_token: str):
         """Set access token directly."""
         self.access_token = access_token
+        # Built once per token. Only MCP calls send it: the client is shared
+        # with OAuth requests, whose endpoints may live on another host.
+        self._mcp_headers = {"Authorization": f"Bearer {access_token}"} if access_token else {}
 
     def mcp_request(self, method: str, params: dict = None, id: int = 1) -> dict:
         """Send MCP JSON-RPC request."""
@@ -240,11 +283,11 @@ class ClaudeMCPClient:
             self.log("Error: No access token set")
             return None
 
-        if not self.endpoint_uuid:
+        if not self._mcp_url:
             self.log("Error: No endpoint UUID set")
             return None
 
-        url = f"{self.base_url}/mcp/{self.endpoint_uuid}"
+        url = self._mcp_url
 
         payload = {
             "jsonrpc": "2.0",
@@ -256,28 +299,91 @@ class ClaudeMCPClient:
 
         self.log(f"\n=== MCP Request: {method} ===")
         self.log(f"POST {url}")
-        self.log(f"Payload: {json.dumps(payload, indent=2)}")
+        if self.verbose:
+            self.log(f"Payload: {json.dumps(payload, indent=2)}")
 
-        response = self.client.post(
-            url,
-            json=payload,
-            headers={
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json",
-                "User-Agent": "Claude-User"  # Match Claude's user agent
-            }
-        )
+        response = self.client.post(url, json=payload, headers=self._mcp_headers)
 
         self.log(f"Status: {response.status_code}")
 
         try:
-            result = response.json()
-            self.log(f"Response: {json.dumps(result, indent=2)}")
+            result = _json_loads(response.content)
+            if self.verbose:
+                self.log(f"Response: {json.dumps(result, indent=2)}")
             return result
         except:
-            self.log(f"Response (raw): {response.text[:500]}")
+            self.log(f"Response (raw): {response.content[:500].decode('utf-8', 'replace')}")
             return {"error": response.text}
 
+    def mcp_batch(self, calls: list) -> list:
+        """Send several MCP requests as one JSON-RPC batch.
+
+        ``calls`` is a list of ``(method, params)`` tuples. Responses are
+        returned in the same order. If the server rejects batches (e.g. with
+        -32600 Invalid Request) the calls are sent as concurrent individual
+        requests instead, so they still cost about one round trip. Other
+        failures (401, 5xx) are returned for every call without retrying.
+        """
+        if not calls:
+            return []
+
+        if not self.access_token:
+            self.log("Error: No access token set")
+            return [None] * len(calls)
+
+        if not self._mcp_url:
+            self.log("Error: No endpoint UUID set")
+            return [None] * len(calls)
+
+        url = self._mcp_url
+
+        payload = []
+        for id, (method, params) in enumerate(calls, 1):
+            request = {
+                "jsonrpc": "2.0",
+                "method": method,
+                "id": id
+            }
+            if params:
+                request["params"] = params
+            payload.append(request)
+
+        self.log(f"\n=== MCP Batch: {', '.join(method for method, _ in calls)} ===")
+        self.log(f"POST {url}")
+        if self.verbose:
+            self.log(f"Payload: {json.dumps(payload, indent=2)}")
+
+        response = self.client.post(url, json=payload, headers=self._mcp_headers)
+
+        self.log(f"Status: {response.status_code}")
+
+        try:
+            result = _json_loads(response.content)
+        except ValueError:
+            result = None
+
+        if isinstance(result, list):
+            by_id = {r.get("id"): r for r in result if isinstance(r, dict)}
+            if self.verbose:
+                self.log(f"Response: {json.dumps(result, indent=2)}")
+            return [by_id.get(id) for id in range(1, len(calls) + 1)]
+
+        # Servers without batch support answer with a single -32600 Invalid
+        # Request error or a single non-array 2xx body
+        error = result.get("error") if isinstance(result, dict) else None
+        rejected = isinstance(error, dict) and error.get("code") == -32600
+        if not (rejected or response.is_success):
+            self.log(f"Batch request failed: {response.content[:500].decode('utf-8', 'replace')}")
+            failure = result if isinstance(result, dict) else {"error": response.text}
+            return [failure] * len(calls)
+
+        self.log("Batch not supported, falling back to concurrent individual requests")
+        # httpx.Client is thread-safe; with HTTP/2 the requests share one connection
+        with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+            futures = [pool.submit(self.mcp_request, method, params, id)
+                       for id, (method, params) in enumerate(calls, 1)]
+            return [future.result() for future in futures]
+
     def initialize(self) -> dict:
         """Send MCP initialize request."""
         return self.mcp_request("initialize", {
@@ -294,7 +400,10 @@ class ClaudeMCPClient:
 
     def initialized_notification(self) -> dict:
         """Send MCP initialized notification."""
-        url = f"{self.base_url}/mcp/{self.endpoint_uuid}"
+        if not self._mcp_url:
+            raise RuntimeError("No endpoint UUID set")
+
+        url = self._mcp_url
         payload = {
             "jsonrpc": "2.0",
             "method": "notifications/initialized"
@@ -302,14 +411,7 @@ class ClaudeMCPClient:
 
         self.log(f"\n=== MCP Notification: initialized ===")
 
-        response = self.client.post(
-            url,
-            json=payload,
-            headers={
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json"
-            }
-        )
+        response = self.client.post(url, json=payload, headers=self._mcp_headers)
         self.log(f"Status: {response.status_code}")
         return {"status": response.status_code}
 
@@ -333,146 +435,152 @@ class ClaudeMCPClient:
         return self.mcp_request("tools/call", params)
 
     def close(self):
-        """Close HTTP clients."""
+        """Close the HTTP client."""
         self.client.close()
-        self.oauth_client.close()
 
 
-def run_full_flow(args):
-    """Run full OAuth + MCP flow."""
-    client = ClaudeMCPClient(args.server, args.endpoint, verbose=True)
+# One client per (server, endpoint) so runners in the same process share
+# connection pools; closed at interpreter exit
+_CLIENTS: dict = {}
 
-    try:
-        # Step 1: Discover OAuth metadata
-        metadata = client.discover_oauth_metadata()
-        if not metadata:
-            print("\nFailed to discover OAuth metadata")
-            return 1
 
-        # Step 2: Discover protected resource
-        resource = client.discover_protected_resource()
-        if resource:
-            print(f"\nResource: {json.dumps(resource, indent=2)}")
+def get_client(base_url: str, endpoint_uuid: str = None) -> ClaudeMCPClient:
+    """Return the shared client for this server and endpoint."""
+    key = (base_url.rstrip('/'), endpoint_uuid)
+    client = _CLIENTS.get(key)
+    if client is None:
+        client = _CLIENTS[key] = ClaudeMCPClient(base_url, endpoint_uuid, verbose=True)
+    return client
 
-        # Step 3: Register client
-        client.register_client()
 
-        # Step 4: Generate authorization URL
-        auth_url, code_verifier, state = client.get_authorization_url()
+@atexit.register
+def _close_clients():
+    for client in _CLIENTS.values():
+        client.close()
+    _CLIENTS.clear()
 
-        print(f"\n{'='*60}")
-        print("AUTHORIZATION REQUIRED")
-        print('='*60)
-        print(f"\n1. Open this URL in your browser:\n\n{auth_url}\n")
-        print("2. Log in and approve the consent")
-        print("3. Copy the 'code' parameter from the redirect URL")
-        print("4. Enter it below:\n")
 
-        code = input("Authorization code: ").strip()
+def run_full_flow(args):
+    """Run full OAuth + MCP flow."""
+    client = get_client(args.server, args.endpoint)
 
-        if not code:
-            print("No code provided, exiting")
-            return 1
+    # Step 1: Discover OAuth metadata
+    metadata = client.discover_oauth_metadata()
+    if not metadata:
+        print("\nFailed to discover OAuth metadata")
+        return 1
 
-        # Step 5: Exchange code for tokens
-        tokens = client.exchange_code(code, code_verifier)
-        if not tokens:
-            print("\nToken exchange failed")
-            return 1
+    # Step 2: Discover protected resource
+    resource = client.discover_protected_resource()
+    if resource:
+        print(f"\nResource: {json.dumps(resource, indent=2)}")
 
-        print(f"\n{'='*60}")
-        print("MCP COMMUNICATION")
-        print('='*60)
+    # Step 3: Register client
+    client.register_client()
 
-        # Step 6: Initialize MCP session
-        init_result = client.initialize()
+    # Step 4: Generate authorization URL
+    auth_url, code_verifier, state = client.get_authorization_url()
 
-        # Step 7: Send initialized notification
-        client.initialized_notification()
+    print(f"\n{'='*60}")
+    print("AUTHORIZATION REQUIRED")
+    print('='*60)
+    print(f"\n1. Open this URL in your browser:\n\n{auth_url}\n")
+    print("2. Log in and approve the consent")
+    print("3. Copy the 'code' parameter from the redirect URL")
+    print("4. Enter it below:\n")
 
-        # Step 8: List tools
-        tools = client.list_tools()
+    code = input("Authorization code: ").strip()
 
-        if tools and 'result' in tools:
-            print(f"\n{'='*60}")
-            print(f"AVAILABLE TOOLS ({len(tools['result'].get('tools', []))})")
-            print('='*60)
-            for tool in tools['result'].get('tools', []):
-                print(f"\n- {tool.get('name')}")
-                print(f"  Description: {tool.get('description', 'N/A')}")
+    if not code:
+        print("No code provided, exiting")
+        return 1
 
-        return 0
+    # Step 5: Exchange code for tokens
+    tokens = client.exchange_code(code, code_verifier)
+    if not tokens:
+        print("\nToken exchange failed")
+        return 1
 
-    finally:
-        client.close()
+    print(f"\n{'='*60}")
+    print("MCP COMMUNICATION")
+    print('='*60)
 
+    # Step 6: Initialize MCP session
+    init_result = client.initialize()
 
-def run_with_token(args):
-    """Run MCP requests with existing token."""
-    client = ClaudeMCPClient(args.server, args.endpoint, verbose=True)
-    client.set_token(args.token)
+    # Step 7: Send initialized notification
+    client.initialized_notification()
+
+    # Step 8: List tools
+    tools = client.list_tools()
 
-    try:
+    if tools and 'result' in tools:
         print(f"\n{'='*60}")
-        print("MCP COMMUNICATION (with existing token)")
+        print(f"AVAILABLE TOOLS ({len(tools['result'].get('tools', []))})")
         print('='*60)
+        for tool in tools['result'].get('tools', []):
+            print(f"\n- {tool.get('name')}")
+            print(f"  Description: {tool.get('description', 'N/A')}")
 
-        # Initialize
-        init_result = client.initialize()
+    return 0
 
-        # Send initialized notification
-        client.initialized_notification()
 
-        # List tools
-        tools = client.list_tools()
+def run_with_token(args):
+    """Run MCP requests with existing token."""
+    client = get_client(args.server, args.endpoint)
+    client.set_token(args.token)
+
+    print(f"\n{'='*60}")
+    print("MCP COMMUNICATION (with existing token)")
+    print('='*60)
 
-        if tools and 'result' in tools:
-            print(f"\n{'='*60}")
-            print(f"AVAILABLE TOOLS ({len(tools['result'].get('tools', []))})")
-            print('='*60)
-            for tool in tools['result'].get('tools', []):
-                print(f"\n- {tool.get('name')}")
-                print(f"  Description: {tool.get('description', 'N/A')}")
-                if tool.get('inputSchema', {}).get('properties'):
-                    print(f"  Parameters: {list(tool['inputSchema']['properties'].keys())}")
+    # Initialize
+    init_result = client.initialize()
 
-        # List resources
-        resources = client.list_resources()
+    # Send initialized notification
+    client.initialized_notification()
 
-        # List prompts
-        prompts = client.list_prompts()
+    # List tools, resources and prompts in a single round trip
+    tools, resources, prompts = client.mcp_batch([
+        ("tools/list", None),
+        ("resources/list", None),
+        ("prompts/list", None),
+    ])
 
-        return 0
+    if tools and 'result' in tools:
+        print(f"\n{'='*60}")
+        print(f"AVAILABLE TOOLS ({len(tools['result'].get('tools', []))})")
+        print('='*60)
+        for tool in tools['result'].get('tools', []):
+            print(f"\n- {tool.get('name')}")
+            print(f"  Description: {tool.get('description', 'N/A')}")
+            if tool.get('inputSchema', {}).get('properties'):
+                print(f"  Parameters: {list(tool['inputSchema']['properties'].keys())}")
 
-    finally:
-        client.close()
+    return 0
 
 
 def run_discover_only(args):
     """Just discover OAuth and resource metadata."""
-    client = ClaudeMCPClient(args.server, args.endpoint, verbose=True)
-
-    try:
-        # OAuth server metadata
-        metadata = client.discover_oauth_metadata()
-        if metadata:
-            print(f"\n{'='*60}")
-            print("OAUTH SERVER METADATA")
-            print('='*60)
-            print(json.dumps(metadata, indent=2))
-
-        # Protected resource metadata
-        resource = client.discover_protected_resource()
-        if resource:
-            print(f"\n{'='*60}")
-            print("PROTECTED RESOURCE METADATA")
-            print('='*60)
-            print(json.dumps(resource, indent=2))
+    client = get_client(args.server, args.endpoint)
 
-        return 0
+    # OAuth server metadata
+    metadata = client.discover_oauth_metadata()
+    if metadata:
+        print(f"\n{'='*60}")
+        print("OAUTH SERVER METADATA")
+        print('='*60)
+        print(json.dumps(metadata, indent=2))
 
-    finally:
-        client.close()
+    # Protected resource metadata
+    resource = client.discover_protected_resource()
+    if resource:
+        print(f"\n{'='*60}")
+        print("PROTECTED RESOURCE METADATA")
+        print('='*60)
+        print(json.dumps(resource, indent=2))
+
+    return 0
 
 
 def main():
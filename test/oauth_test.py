@@ -12,12 +12,22 @@ Usage:
 """
 
 import argparse
-import requests
 import json
 import sys
+import importlib.util
 from urllib.parse import urlencode
 
-def exchange_auth_code(server_url: str, code: str, client_id: str, client_secret: str, redirect_uri: str):
+try:
+    import httpx
+except ImportError:
+    print("Please install httpx: pip install 'httpx[http2]'")
+    sys.exit(1)
+
+# HTTP/2 lets the token and MCP calls share one multiplexed connection;
+# it needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+def exchange_auth_code(client: httpx.Client, server_url: str, code: str, client_id: str, client_secret: str, redirect_uri: str):
     """Exchange authorization code for access token using client_secret."""
     token_url = f"{server_url}/api/oauth/token"
 
@@ -33,18 +43,15 @@ def exchange_auth_code(server_url: str, code: str, client_id: str, client_secret
     print(f"URL: {token_url}")
     print(f"Data: {json.dumps(data, indent=2)}")
 
-    response = requests.post(
-        token_url,
-        data=data,
-        headers={"Content-Type": "application/x-www-form-urlencoded"}
-    )
+    # httpx sets the form-urlencoded Content-Type for dict data
+    response = client.post(token_url, data=data)
 
     print(f"\nStatus: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
 
-    return response.json() if response.ok else None
+    return response.json() if response.is_success else None
 
-def refresh_token(server_url: str, refresh_tok: str):
+def refresh_token(client: httpx.Client, server_url: str, refresh_tok: str):
     """Refresh an access token."""
     token_url = f"{server_url}/api/oauth/token"
 
@@ -56,18 +63,14 @@ def refresh_token(server_url: str, refresh_tok: str):
     print(f"\n=== Token Refresh ===")
     print(f"URL: {token_url}")
 
-    response = requests.post(
-        token_url,
-        data=data,
-        headers={"Content-Type": "application/x-www-form-urlencoded"}
-    )
+    response = client.post(token_url, data=data)
 
     print(f"\nStatus: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
 
-    return response.json() if response.ok else None
+    return response.json() if response.is_success else None
 
-def test_mcp_endpoint(server_url: str, access_token: str, endpoint_uuid: str = None):
+def test_mcp_endpoint(client: httpx.Client, server_url: str, access_token: str, endpoint_uuid: str = None):
     """Test MCP endpoint with access token."""
     if endpoint_uuid:
         mcp_url = f"{server_url}/api/mcp/{endpoint_uuid}"
@@ -78,13 +81,10 @@ def test_mcp_endpoint(server_url: str, access_token: str, endpoint_uuid: str = N
     print(f"URL: {mcp_url}")
 
     # Test tools/list
-    response = requests.post(
+    response = client.post(
         mcp_url,
         json={"jsonrpc": "2.0", "method": "tools/list", "id": 1},
-        headers={
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json"
-        }
+        headers={"Authorization": f"Bearer {access_token}"}
     )
 
     print(f"\nStatus: {response.status_code}")
@@ -93,7 +93,7 @@ def test_mcp_endpoint(server_url: str, access_token: str, endpoint_uuid: str = N
     except:
         print(f"Response: {response.text[:500]}")
 
-    return response.ok
+    return response.is_success
 
 def build_auth_url(server_url: str, client_id: str, redirect_uri: str, scopes: list = None):
     """Build authorization URL for manual browser flow."""
@@ -130,29 +130,34 @@ def main():
         print(f"\nOpen this URL in your browser:\n{url}")
         return
 
-    if args.refresh:
-        result = refresh_token(args.server, args.refresh)
-        if result and "access_token" in result:
-            print("\n✅ Token refresh successful!")
-            test_mcp_endpoint(args.server, result["access_token"], args.endpoint_uuid)
-        return
-
-    if args.access_token:
-        test_mcp_endpoint(args.server, args.access_token, args.endpoint_uuid)
-        return
-
-    if args.code:
-        result = exchange_auth_code(
-            args.server,
-            args.code,
-            args.client_id,
-            args.client_secret,
-            args.redirect_uri
-        )
-        if result and "access_token" in result:
-            print("\n✅ Token exchange successful!")
-            test_mcp_endpoint(args.server, result["access_token"], args.endpoint_uuid)
-        return
+    # One client so token, refresh and MCP calls reuse the same connection
+    transport = httpx.HTTPTransport(http2=HTTP2_AVAILABLE, retries=3)
+    # follow_redirects matches the requests behaviour (e.g. http -> https)
+    with httpx.Client(transport=transport, timeout=30, follow_redirects=True) as client:
+        if args.refresh:
+            result = refresh_token(client, args.server, args.refresh)
+            if result and "access_token" in result:
+                print("\n✅ Token refresh successful!")
+                test_mcp_endpoint(client, args.server, result["access_token"], args.endpoint_uuid)
+            return
+
+        if args.access_token:
+            test_mcp_endpoint(client, args.server, args.access_token, args.endpoint_uuid)
+            return
+
+        if args.code:
+            result = exchange_auth_code(
+                client,
+                args.server,
+                args.code,
+                args.client_id,
+                args.client_secret,
+                args.redirect_uri
+            )
+            if result and "access_token" in result:
+                print("\n✅ Token exchange successful!")
+                test_mcp_endpoint(client, args.server, result["access_token"], args.endpoint_uuid)
+            return
 
     # Default: show auth URL
     url = build_auth_url(args.server, args.client_id, args.redirect_uri)
@@ -10,6 +10,19 @@ import websockets
 import uuid
 import argparse
 
+# orjson is optional - falls back to the stdlib json module
+try:
+    import orjson
+
+    def _json_dumps(data):
+        # Decode so websockets still sends a text frame
+        return orjson.dumps(data).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
 # WebSocket server URL
 WS_URL = "wss://screencontrol.knws.co.uk/ws"
 
@@ -17,9 +30,92 @@ WS_URL = "wss://screencontrol.knws.co.uk/ws"
 ENDPOINT_UUID = "cmivv9aar000310vcfp9lg0qj"
 CUSTOMER_ID = "cmivqj7nk000054pkib1rkjdb"
 
-
-async def send_tool_request(tool_name, arguments=None):
-    """Send a tool execution request via WebSocket and wait for response"""
+# Tools exercised by run_tests, as (name, arguments)
+TESTS = [
+    ("desktop_list_applications", None),
+    ("desktop_screenshot", None),
+    ("desktop_press_key", {"key": "escape"}),  # safe key
+]
+
+
+class ToolConnection:
+    """A single registered WebSocket connection shared by every tool test.
+
+    A background reader routes each incoming message to the request with the
+    matching ``id``, so several requests can be in flight at once.
+    """
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.pending = {}
+        self.reader = None
+
+    async def register(self):
+        """Register as the control server and start routing replies."""
+        register_msg = {
+            "type": "register",
+            "role": "server",
+            "endpointUuid": ENDPOINT_UUID
+        }
+        await self.websocket.send(_json_dumps(register_msg))
+        print("✓ Registered as server")
+
+        # Wait for registration response
+        response = await self.websocket.recv()
+        reg_response = _json_loads(response)
+        print(f"  Registration response: {reg_response.get('type')}")
+
+        self.reader = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self):
+        try:
+            async for message in self.websocket:
+                try:
+                    result = _json_loads(message)
+                except ValueError:
+                    result = None
+                future = None
+                if isinstance(result, dict):
+                    future = self.pending.pop(result.get("id"), None)
+                if future is None:
+                    # e.g. a server {"type": "error"} not tied to a request
+                    print(f"  ? Unmatched message: {str(message)[:500]}")
+                elif not future.done():
+                    future.set_result(result)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("WebSocket closed"))
+            self.pending.clear()
+
+    async def request(self, method, params, timeout=10.0):
+        """Send a request and wait for the reply carrying the same id."""
+        request_id = str(uuid.uuid4())
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+
+        await self.websocket.send(_json_dumps({
+            "type": "request",
+            "id": request_id,
+            "method": method,
+            "params": params
+        }))
+        print(f"→ Sent tool request (ID: {request_id[:8]}...)")
+
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self.pending.pop(request_id, None)
+
+    async def close(self):
+        if self.reader is not None:
+            self.reader.cancel()
+
+
+async def send_tool_request(connection, tool_name, arguments=None):
+    """Send a tool execution request over the shared connection and wait for response"""
     if arguments is None:
         arguments = {}
 
@@ -29,70 +125,58 @@ async def send_tool_request(tool_name, arguments=None):
         print(f"Arguments: {json.dumps(arguments)}")
         print(f"{'='*60}")
 
-        async with websockets.connect(WS_URL) as websocket:
-            # Register as the control server
-            register_msg = {
-                "type": "register",
-                "role": "server",
-                "endpointUuid": ENDPOINT_UUID
-            }
-            await websocket.send(json.dumps(register_msg))
-            print("✓ Registered as server")
-
-            # Wait for registration response
-            response = await websocket.recv()
-            reg_response = json.loads(response)
-            print(f"  Registration response: {reg_response.get('type')}")
-
-            # Send tool execution request
-            request_id = str(uuid.uuid4())
-            tool_request = {
-                "type": "request",
-                "id": request_id,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": arguments
-                }
-            }
-            await websocket.send(json.dumps(tool_request))
-            print(f"→ Sent tool request (ID: {request_id[:8]}...)")
-
-            # Wait for response (with timeout)
-            try:
-                response = await asyncio.wait_for(websocket.recv(), timeout=10.0)
-                result = json.loads(response)
-
-                print(f"\n← Received response:")
-                if result.get("type") == "response":
-                    if "error" in result.get("result", {}):
-                        print(f"  ✗ Error: {result['result']['error']}")
-                        return False
-                    else:
-                        # Truncate large results (like screenshots)
-                        result_str = json.dumps(result.get("result", {}), indent=2)
-                        if len(result_str) > 500:
-                            print(f"  ✓ Success (result truncated):")
-                            print(f"  {result_str[:500]}...")
-                        else:
-                            print(f"  ✓ Success:")
-                            print(f"  {result_str}")
-                        return True
-                else:
-                    print(f"  ? Unexpected response type: {result.get('type')}")
-                    print(f"  {json.dumps(result, indent=2)}")
+        # Send tool execution request and wait for response (with timeout)
+        try:
+            result = await connection.request("tools/call", {
+                "name": tool_name,
+                "arguments": arguments
+            })
+
+            print(f"\n← Received response:")
+            if result.get("type") == "response":
+                if "error" in result.get("result", {}):
+                    print(f"  ✗ Error: {result['result']['error']}")
                     return False
-
-            except asyncio.TimeoutError:
-                print(f"  ✗ Timeout waiting for response")
+                else:
+                    # Truncate large results (like screenshots)
+                    result_str = json.dumps(result.get("result", {}), indent=2)
+                    if len(result_str) > 500:
+                        print(f"  ✓ Success (result truncated):")
+                        print(f"  {result_str[:500]}...")
+                    else:
+                        print(f"  ✓ Success:")
+                        print(f"  {result_str}")
+                    return True
+            else:
+                print(f"  ? Unexpected response type: {result.get('type')}")
+                print(f"  {json.dumps(result, indent=2)}")
                 return False
 
+        except asyncio.TimeoutError:
+            print(f"  ✗ Timeout waiting for response")
+            return False
+
     except Exception as e:
         print(f"  ✗ Error: {e}")
         return False
 
 
-async def run_tests():
+async def run_single(tool_name, arguments):
+    """Connect, register and run one tool test"""
+    try:
+        async with websockets.connect(WS_URL) as websocket:
+            connection = ToolConnection(websocket)
+            await connection.register()
+            try:
+                return await send_tool_request(connection, tool_name, arguments)
+            finally:
+                await connection.close()
+    except Exception as e:
+        print(f"  ✗ Error: {e}")
+        return False
+
+
+async def run_tests(inter_request_delay=0.0):
     """Run all desktop tool tests"""
     print("🧪 Testing Desktop Tools via WebSocket")
     print(f"Server: {WS_URL}")
@@ -101,27 +185,28 @@ async def run_tests():
     passed = 0
     failed = 0
 
-    # Test 1: desktop_list_applications
-    if await send_tool_request("desktop_list_applications"):
-        passed += 1
-    else:
-        failed += 1
-
-    await asyncio.sleep(1)
-
-    # Test 2: desktop_screenshot
-    if await send_tool_request("desktop_screenshot"):
-        passed += 1
-    else:
-        failed += 1
+    # One connection and one registration for the whole run
+    try:
+        async with websockets.connect(WS_URL) as websocket:
+            connection = ToolConnection(websocket)
+            await connection.register()
 
-    await asyncio.sleep(1)
+            try:
+                for i, (tool_name, arguments) in enumerate(TESTS):
+                    # Replies are matched by id, so pacing is only needed if the device wants it
+                    if i and inter_request_delay:
+                        await asyncio.sleep(inter_request_delay)
 
-    # Test 3: desktop_press_key (safe key)
-    if await send_tool_request("desktop_press_key", {"key": "escape"}):
-        passed += 1
-    else:
-        failed += 1
+                    if await send_tool_request(connection, tool_name, arguments):
+                        passed += 1
+                    else:
+                        failed += 1
+            finally:
+                await connection.close()
+    except Exception as e:
+        # Could not connect/register: count every test that did not run as failed
+        print(f"  ✗ Error: {e}")
+        failed = len(TESTS) - passed
 
     # Summary
     print(f"\n{'='*60}")
@@ -140,13 +225,22 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Test desktop tools via WebSocket')
     parser.add_argument('--tool', help='Test a specific tool only')
     parser.add_argument('--args', help='Tool arguments as JSON string')
+    parser.add_argument('--inter-request-delay', type=float, default=0.0,
+                        help='Seconds to wait between tool requests (default: 0)')
     args = parser.parse_args()
 
+    # uvloop is optional - a faster event loop for the WebSocket I/O if installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     if args.tool:
         # Test single tool
         tool_args = json.loads(args.args) if args.args else {}
-        success = asyncio.run(send_tool_request(args.tool, tool_args))
+        success = asyncio.run(run_single(args.tool, tool_args))
         exit(0 if success else 1)
     else:
         # Run all tests
-        exit(asyncio.run(run_tests()))
+        exit(asyncio.run(run_tests(args.inter_request_delay)))